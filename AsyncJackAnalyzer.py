@@ -0,0 +1,183 @@
+"""
+This file is part of nand2tetris, as taught in The Hebrew University, and
+was written by Aviv Yaish. It is an extension to the specifications given
+[here](https://www.nand2tetris.org) (Shimon Schocken and Noam Nisan, 2017),
+as allowed by the Creative Common Attribution-NonCommercial-ShareAlike 3.0
+Unported [License](https://creativecommons.org/licenses/by-nc-sa/3.0/).
+"""
+import asyncio
+import concurrent.futures
+import io
+import os
+import typing
+from JackAnalyzer import analyze_file, list_jack_files
+
+
+# The XML of a file is about ten times the size of its Jack source.
+OUTPUT_BYTES_PER_INPUT_BYTE = 10
+
+
+def analyze_source(source: str) -> str:
+    """Analyzes the source of a single file.
+
+    Args:
+        source (str): the Jack code to analyze.
+
+    Returns:
+        str: the XML output for the code.
+    """
+    output_file = io.StringIO()
+    analyze_file(io.StringIO(source), output_file)
+    return output_file.getvalue()
+
+
+def _read_file(input_path: str) -> str:
+    with open(input_path, 'r') as input_file:
+        return input_file.read()
+
+
+def _write_file(output_path: str, output: str) -> None:
+    with open(output_path, 'w') as output_file:
+        output_file.write(output)
+
+
+def _shutdown_executors(
+        executors: typing.List[concurrent.futures.Executor]) -> None:
+    for executor in executors:
+        executor.shutdown()
+
+
+class _ByteBudget:
+    """Caps the number of bytes of input and output held in memory at once."""
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self.bytes_in_flight = 0
+        self._condition = asyncio.Condition()
+
+    async def acquire(self, size: int) -> int:
+        """Waits until size bytes fit in the budget, and takes them.
+
+        A file larger than the whole budget is let through once nothing
+        else is in flight, so that it can still be analyzed.
+
+        Returns:
+            int: the number of bytes taken, to be passed to release().
+        """
+        size = min(size, self.max_bytes)
+        async with self._condition:
+            await self._condition.wait_for(
+                lambda: self.bytes_in_flight + size <= self.max_bytes)
+            self.bytes_in_flight += size
+        return size
+
+    async def resize(self, old_size: int, new_size: int) -> int:
+        """Replaces a charge taken by acquire() with its actual size.
+
+        This does not wait, as the memory is already in use by then.
+
+        Returns:
+            int: the number of bytes now taken, to be passed to release().
+        """
+        async with self._condition:
+            self.bytes_in_flight += new_size - old_size
+            self._condition.notify_all()
+        return new_size
+
+    async def release(self, size: int) -> None:
+        async with self._condition:
+            self.bytes_in_flight -= size
+            self._condition.notify_all()
+
+
+async def analyze_paths_async(
+        paths: typing.Iterable[str],
+        max_files_in_flight: int = 8,
+        max_bytes_in_flight: int = 64 * 1024 * 1024,
+        io_workers: int = 4,
+        parse_executor: typing.Optional[concurrent.futures.Executor] = None
+) -> typing.List[str]:
+    """Analyzes every .jack file under the given paths, overlapping the file
+    I/O of some files with the parsing of others.
+
+    Files are read and written on a thread pool and parsed on
+    parse_executor, so slow (e.g. network mounted) storage does not stall
+    the parsing. At most max_files_in_flight files are being handled at
+    any moment. Before a file is read, its input plus its estimated output
+    (OUTPUT_BYTES_PER_INPUT_BYTE times the input) is charged against
+    max_bytes_in_flight, and once it is parsed the charge becomes the
+    actual size of the output, until the output is written. A file may
+    exceed its estimate, so the bound is approximate.
+
+    Args:
+        paths (typing.Iterable[str]): .jack files and/or directories of
+            .jack files, as accepted by JackAnalyzer.
+        max_files_in_flight (int): how many files may be between being read
+            and being written at once.
+        max_bytes_in_flight (int): roughly how many bytes of input and output
+            may be held in memory at once.
+        io_workers (int): how many threads do the file I/O.
+        parse_executor (typing.Optional[concurrent.futures.Executor]): where
+            the parsing runs. Defaults to a new process pool, which is shut
+            down when this returns.
+
+    Returns:
+        typing.List[str]: the paths of the written XML files, in input order.
+
+    Raises:
+        ValueError: if max_files_in_flight or io_workers is less than 1.
+    """
+    if max_files_in_flight < 1:
+        raise ValueError(
+            f"max_files_in_flight must be at least 1, got {max_files_in_flight}")
+    if io_workers < 1:
+        raise ValueError(f"io_workers must be at least 1, got {io_workers}")
+    loop = asyncio.get_running_loop()
+    jack_files = [jack_file for path in paths
+                  for jack_file in list_jack_files(path)]
+    pending = iter(jack_files)
+    budget = _ByteBudget(max_bytes_in_flight)
+    owns_parse_executor = parse_executor is None
+    if owns_parse_executor:
+        parse_executor = concurrent.futures.ProcessPoolExecutor()
+    io_executor = concurrent.futures.ThreadPoolExecutor(io_workers)
+
+    async def worker() -> None:
+        # Every worker handles one file at a time, so the number of workers
+        # is the number of files in flight.
+        for input_path, output_path in pending:
+            size = await loop.run_in_executor(
+                io_executor, os.path.getsize, input_path)
+            size = await budget.acquire(
+                size * (1 + OUTPUT_BYTES_PER_INPUT_BYTE))
+            try:
+                source = await loop.run_in_executor(
+                    io_executor, _read_file, input_path)
+                output = await loop.run_in_executor(
+                    parse_executor, analyze_source, source)
+                del source
+                size = await budget.resize(size, len(output))
+                await loop.run_in_executor(
+                    io_executor, _write_file, output_path, output)
+            finally:
+                await budget.release(size)
+
+    workers = [asyncio.ensure_future(worker())
+               for _ in range(min(max_files_in_flight, len(jack_files)))]
+    executors = [io_executor]
+    if owns_parse_executor:
+        executors.append(parse_executor)
+    try:
+        await asyncio.gather(*workers)
+    except BaseException:
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        # Waiting for a parse that is still running would block the loop.
+        for executor in executors:
+            executor.shutdown(wait=False, cancel_futures=True)
+        raise
+    # All the work is done, but joining the pools still takes a while, so
+    # it is done off the loop.
+    await loop.run_in_executor(None, _shutdown_executors, executors)
+    return [output_path for _, output_path in jack_files]
@@ -8,258 +8,340 @@ Unported [License](https://creativecommons.org/licenses/by-nc-sa/3.0/).
 import typing
 from JackTokenizer import JackTokenizer
 
+# Parse events, as yielded by iter_events() and the compile_* generators.
+START_ELEMENT = "start"
+TERMINAL = "terminal"
+END_ELEMENT = "end"
+
+# (event, kind, value, position): kind is the XML tag name, value is the
+# token (None for start/end elements) and position is its source line.
+Event = typing.Tuple[str, str, typing.Any, int]
+
+# Only these terminals can contain the characters XML needs escaped.
+_ESCAPED_KINDS = frozenset(["symbol", "stringConstant"])
+_XML_ESCAPES = str.maketrans({"&": "&amp;", "<": "&lt;", ">": "&gt;"})
+
+
+def iter_events(tokenizer: JackTokenizer) -> typing.Iterator[Event]:
+    """Parses a whole class lazily, yielding its structure as it goes.
+
+    The tokenizer reads the input one line at a time, so consumers that do
+    not need the XML text use memory bounded by the longest line and the
+    deepest nesting, not by the size of the file.
+
+    Args:
+        tokenizer (JackTokenizer): the tokens of the class to parse.
+
+    Returns:
+        typing.Iterator[Event]: start-element, terminal and end-element
+        events, in document order.
+    """
+    return CompilationEngine(tokenizer).compile_class()
+
+
+def write_xml(events: typing.Iterable[Event], output_stream) -> None:
+    """Writes parse events to the output stream as the project's XML.
+
+    Args:
+        events (typing.Iterable[Event]): the events to write.
+        output_stream: writes all output to this stream.
+    """
+    write = output_stream.write
+    for event, kind, value, _ in events:
+        if event == TERMINAL:
+            if kind in _ESCAPED_KINDS:
+                value = value.translate(_XML_ESCAPES)
+            write(f"<{kind}> {value} </{kind}>\n")
+        elif event == START_ELEMENT:
+            write(f"<{kind}>\n")
+        else:
+            write(f"</{kind}>\n")
+
+
 class CompilationEngine:
     """
-    Gets input from a JackTokenizer and emits its parsed structure into an
-    output stream.
+    Gets input from a JackTokenizer and emits its parsed structure, either
+    as parse events or into an output stream.
     """
 
-    def __init__(self, input_stream: JackTokenizer, output_stream) -> None:
+    def __init__(self, input_stream: JackTokenizer, output_stream=None) -> None:
         """
-        Creates a new compilation engine with the given input and output. The
-        next routine called must be compileClass()
+        Creates a new compilation engine with the given input and output.
+        If an output stream is given, the whole class is compiled into it
+        right away; otherwise the next routine called must be compileClass(),
+        whose events the caller consumes.
         :param input_stream: The input stream.
         :param output_stream: The output stream.
         """
         self.input_stream = input_stream
         self.output_stream = output_stream
         self.current_type_processed = ""
-        self.compile_class()
+        self._last_position = 0
+        self._start_positions = []
+        if output_stream is not None:
+            write_xml(self.compile_class(), output_stream)
+
+    # An element starts on the line of its first token and ends on the line
+    # of its last one. An empty element has neither, so it both starts and
+    # ends on the line of the token that follows it.
+
+    def _start(self, kind: str) -> Event:
+        position = self.input_stream.line_number()
+        self._start_positions.append(position)
+        return (START_ELEMENT, kind, None, position)
+
+    def _terminal(self, kind: str, value: typing.Any,
+                  position: typing.Optional[int] = None) -> Event:
+        if position is None:
+            position = self.input_stream.line_number()
+        self._last_position = position
+        return (TERMINAL, kind, value, position)
+
+    def _end(self, kind: str) -> Event:
+        # The tokenizer is already past the element here, so use the line of
+        # its last terminal, which is before the start if the element is
+        # empty.
+        position = self._start_positions.pop()
+        if self._last_position > position:
+            position = self._last_position
+        return (END_ELEMENT, kind, None, position)
 
-    def compile_class(self) -> None:
+    def compile_class(self) -> typing.Iterator[Event]:
         """Compiles a complete class."""
         # Your code goes here!
         self.input_stream.advance()
-        self.output_stream.write("<class>\n")
-        self.output_stream.write(f"<keyword> {self.input_stream.keyword()} </keyword>\n")
+        yield self._start("class")
+        yield self._terminal("keyword", self.input_stream.keyword())
         self.input_stream.advance()
-        self.output_stream.write(f"<identifier> {self.input_stream.identifier()} </identifier>\n")
+        yield self._terminal("identifier", self.input_stream.identifier())
         self.input_stream.advance()
-        self.output_stream.write(f"<symbol> {self.input_stream.symbol()} </symbol>\n")
-        self.compile_class_var_dec()
-        self.compile_subroutine()
+        yield self._terminal("symbol", self.input_stream.symbol())
+        yield from self.compile_class_var_dec()
+        yield from self.compile_subroutine()
         #self.input_stream.advance() #TODO check if needed
-        self.output_stream.write(f"<symbol> {self.input_stream.symbol()} </symbol>\n")
-        self.output_stream.write("</class>")
+        yield self._terminal("symbol", self.input_stream.symbol())
+        yield self._end("class")
 
-    def compile_class_var_dec(self) -> None:
+    def compile_class_var_dec(self) -> typing.Iterator[Event]:
         """Compiles a static declaration or a field declaration."""
-        self.compile_all_vars_in_dec(True)
+        yield from self.compile_all_vars_in_dec(True)
 
-    def compile_all_vars_in_dec(self, is_class_var_dec: bool) -> None:
+    def compile_all_vars_in_dec(self, is_class_var_dec: bool) -> typing.Iterator[Event]:
         self.input_stream.advance()
         type_of_var = "classVarDec" if is_class_var_dec else "varDec"
         lst_to_be_in = ["static", "field"] if is_class_var_dec else ['var']
         while self.input_stream.token_type() == "KEYWORD" and self.input_stream.keyword() in lst_to_be_in:
-            self.output_stream.write(f"<{type_of_var}>\n")
-            self.output_stream.write(f"<keyword> {self.input_stream.keyword()} </keyword>\n")
+            yield self._start(type_of_var)
+            yield self._terminal("keyword", self.input_stream.keyword())
             self.input_stream.advance()
-            self.output_stream.write(f"<{self.input_stream.token_type().lower()}>{self.input_stream.identifier()}</{self.input_stream.token_type().lower()}>\n")
+            yield self._terminal(self.input_stream.token_type().lower(), self.input_stream.identifier())
             self.input_stream.advance()
-            self.output_stream.write(f"<identifier> {self.input_stream.identifier()} </identifier>\n")
+            yield self._terminal("identifier", self.input_stream.identifier())
             self.input_stream.advance()
             while self.input_stream.token_type() == "SYMBOL" and self.input_stream.symbol() == ",":
-                self.output_stream.write(f"<symbol> {self.input_stream.symbol()} </symbol>\n")
+                yield self._terminal("symbol", self.input_stream.symbol())
                 self.input_stream.advance()
-                self.output_stream.write(f"<identifier> {self.input_stream.identifier()} </identifier>\n")
+                yield self._terminal("identifier", self.input_stream.identifier())
                 self.input_stream.advance()
-            self.output_stream.write(f"<symbol> {self.input_stream.symbol()} </symbol>\n")
-            self.output_stream.write(f"</{type_of_var}>\n")
+            yield self._terminal("symbol", self.input_stream.symbol())
+            yield self._end(type_of_var)
             self.input_stream.advance()
 
-    def compile_subroutine(self) -> None:
+    def compile_subroutine(self) -> typing.Iterator[Event]:
         """
         Compiles a complete method, function, or constructor.
         You can assume that classes with constructors have at least one field,
         you will understand why this is necessary in project 11.
         """
         while self.input_stream.token_type() == "KEYWORD" and self.input_stream.keyword() in ["constructor", "function", "method"]:
-            self.output_stream.write("<subroutineDec>\n") # Start of subroutine declaration
-            self.output_stream.write(f"<keyword> {self.input_stream.keyword()} </keyword>\n") #type: method, constructor, function
+            yield self._start("subroutineDec") # Start of subroutine declaration
+            yield self._terminal("keyword", self.input_stream.keyword()) #type: method, constructor, function
             self.input_stream.advance()
-            self.output_stream.write(f"<{self.input_stream.token_type().lower()}>{self.input_stream.identifier()}</{self.input_stream.token_type().lower()}>\n") # type: void | type
+            yield self._terminal(self.input_stream.token_type().lower(), self.input_stream.identifier()) # type: void | type
             self.input_stream.advance()
-            self.output_stream.write(f"<identifier> {self.input_stream.identifier()} </identifier>\n") #subroutineName
+            yield self._terminal("identifier", self.input_stream.identifier()) #subroutineName
             self.input_stream.advance()
-            self.output_stream.write(f"<symbol> {self.input_stream.symbol()} </symbol>\n") # (
-            self.compile_parameter_list()
-            self.output_stream.write(f"<symbol> {self.input_stream.symbol()} </symbol>\n") # )
+            yield self._terminal("symbol", self.input_stream.symbol()) # (
+            yield from self.compile_parameter_list()
+            yield self._terminal("symbol", self.input_stream.symbol()) # )
             self.input_stream.advance()
-            self.output_stream.write("<subroutineBody>\n")
-            self.output_stream.write(f"<symbol> {self.input_stream.symbol()} </symbol>\n") # {
-            self.compile_var_dec()
+            yield self._start("subroutineBody")
+            yield self._terminal("symbol", self.input_stream.symbol()) # {
+            yield from self.compile_var_dec()
             # self.output_stream.advance()
-            self.compile_statements()
-            self.output_stream.write(f"<symbol> {self.input_stream.symbol()} </symbol>\n") # }
-            self.output_stream.write("</subroutineBody>\n")
-            self.output_stream.write("</subroutineDec>\n")
+            yield from self.compile_statements()
+            yield self._terminal("symbol", self.input_stream.symbol()) # }
+            yield self._end("subroutineBody")
+            yield self._end("subroutineDec")
             self.input_stream.advance()
 
-    def compile_parameter_list(self) -> None:
+    def compile_parameter_list(self) -> typing.Iterator[Event]:
         """Compiles a (possibly empty) parameter list, not including the 
         enclosing "()".
         """
-        self.output_stream.write("<parameterList>\n")
         self.input_stream.advance()
+        yield self._start("parameterList")
         while not self.input_stream.token_type == "SYMBOL" and self.input_stream.symbol() != ')':
-            self.output_stream.write(f"<{self.input_stream.token_type().lower()}>{self.input_stream.identifier()}</{self.input_stream.token_type().lower()}>\n") #type / className
+            yield self._terminal(self.input_stream.token_type().lower(), self.input_stream.identifier()) #type / className
             self.input_stream.advance()
-            self.output_stream.write(f"<identifier> {self.input_stream.identifier()} </identifier>\n") #varName
+            yield self._terminal("identifier", self.input_stream.identifier()) #varName
             self.input_stream.advance()
             if self.input_stream.token_type() == "SYMBOL" and self.input_stream.symbol() == ",":
-                self.output_stream.write(f"<symbol> {self.input_stream.symbol()} </symbol>\n")
+                yield self._terminal("symbol", self.input_stream.symbol())
                 self.input_stream.advance()
-        self.output_stream.write("</parameterList>\n")
+        yield self._end("parameterList")
 
-    def compile_var_dec(self) -> None:
+    def compile_var_dec(self) -> typing.Iterator[Event]:
         """Compiles a var declaration."""
-        self.compile_all_vars_in_dec(False)
+        yield from self.compile_all_vars_in_dec(False)
 
-    def compile_statements(self) -> None:
+    def compile_statements(self) -> typing.Iterator[Event]:
         """Compiles a sequence of statements, not including the enclosing 
         "{}".
         """
-        self.output_stream.write("<statements>\n")
+        yield self._start("statements")
         while self.input_stream.token_type() == "KEYWORD" and self.input_stream.keyword() in ["let", "if", "while", "do", "return"]:
             if self.input_stream.keyword() == "let":
-                self.compile_let()
+                yield from self.compile_let()
             elif self.input_stream.keyword() == "if":
-                self.compile_if()
+                yield from self.compile_if()
             elif self.input_stream.keyword() == "while":
-                self.compile_while()
+                yield from self.compile_while()
             elif self.input_stream.keyword() == "do":
-                self.compile_do()
+                yield from self.compile_do()
             elif self.input_stream.keyword() == "return":
-                self.compile_return()
+                yield from self.compile_return()
             # TODO: check if advanced is need here.
             # self.input_stream.advance()
-        self.output_stream.write("</statements>\n")
+        yield self._end("statements")
 
-    def compile_do(self) -> None:
+    def compile_do(self) -> typing.Iterator[Event]:
         """Compiles a do statement."""
         # Your code goes here!
-        self.output_stream.write("<doStatement>\n")
-        self.output_stream.write(f"<keyword> {self.input_stream.keyword()} </keyword>\n") #do
+        yield self._start("doStatement")
+        yield self._terminal("keyword", self.input_stream.keyword()) #do
         self.input_stream.advance()
-        self.compile_subroutine_call()
-        self.output_stream.write(f"<symbol> {self.input_stream.symbol()} </symbol>\n") #;
+        yield from self.compile_subroutine_call()
+        yield self._terminal("symbol", self.input_stream.symbol()) #;
         self.input_stream.advance()
-        self.output_stream.write("</doStatement>\n")
+        yield self._end("doStatement")
 
-    def compile_subroutine_call(self, first_token: str = "") -> None:
+    def compile_subroutine_call(self, first_token: str = "",
+                                first_position: typing.Optional[int] = None) -> typing.Iterator[Event]:
         """
         Compiles a subroutine call.
         """
         if first_token == "":
             first_token = self.input_stream.identifier()
+            first_position = self.input_stream.line_number()
             self.input_stream.advance()
-        self.output_stream.write(f"<identifier> {first_token} </identifier>\n") #className | subroutineName
-        self.output_stream.write(f"<symbol> {self.input_stream.symbol()} </symbol>\n")
+        yield self._terminal("identifier", first_token, first_position) #className | subroutineName
+        yield self._terminal("symbol", self.input_stream.symbol())
         while self.input_stream.symbol() == ".":
             self.input_stream.advance()
-            self.output_stream.write(f"<identifier> {self.input_stream.identifier()} </identifier>\n")
+            yield self._terminal("identifier", self.input_stream.identifier())
             self.input_stream.advance()
-            self.output_stream.write(f"<symbol> {self.input_stream.symbol()} </symbol>\n") # . or ( in the last iteration
+            yield self._terminal("symbol", self.input_stream.symbol()) # . or ( in the last iteration
         self.input_stream.advance()
-        self.compile_expression_list()
-        self.output_stream.write(f"<symbol> {self.input_stream.symbol()} </symbol>\n") # )
+        yield from self.compile_expression_list()
+        yield self._terminal("symbol", self.input_stream.symbol()) # )
         self.input_stream.advance()
 
 
-    def compile_let(self) -> None:
+    def compile_let(self) -> typing.Iterator[Event]:
         """Compiles a let statement."""
         # Your code goes here!
-        self.output_stream.write("<letStatement>\n")
-        self.output_stream.write(f"<keyword> {self.input_stream.keyword()} </keyword>\n") #let
+        yield self._start("letStatement")
+        yield self._terminal("keyword", self.input_stream.keyword()) #let
         self.input_stream.advance()
-        self.output_stream.write(f"<identifier> {self.input_stream.identifier()} </identifier>\n") # varName
+        yield self._terminal("identifier", self.input_stream.identifier()) # varName
         self.input_stream.advance()
-        self.output_stream.write(f"<symbol> {self.input_stream.symbol()} </symbol>\n") # = or [
+        yield self._terminal("symbol", self.input_stream.symbol()) # = or [
         if self.input_stream.symbol() == "[":
             self.input_stream.advance()
-            self.compile_expression() #TODO: should finish after the advancing to the ] token
-            self.output_stream.write(f"<symbol> {self.input_stream.symbol()} </symbol>\n") # ]
+            yield from self.compile_expression() #TODO: should finish after the advancing to the ] token
+            yield self._terminal("symbol", self.input_stream.symbol()) # ]
             self.input_stream.advance()
-            self.output_stream.write(f"<symbol> {self.input_stream.symbol()} </symbol>\n") # =
+            yield self._terminal("symbol", self.input_stream.symbol()) # =
         self.input_stream.advance()
-        self.compile_expression()
-        self.output_stream.write(f"<symbol> {self.input_stream.symbol()} </symbol>\n") # ;
+        yield from self.compile_expression()
+        yield self._terminal("symbol", self.input_stream.symbol()) # ;
         self.input_stream.advance()
-        self.output_stream.write("</letStatement>\n")
+        yield self._end("letStatement")
 
-    def compile_while(self) -> None:
+    def compile_while(self) -> typing.Iterator[Event]:
         """Compiles a while statement.
             receive it with current token as 'while'
             returns it with current token as the after }
         """
-        self.output_stream.write("<whileStatement>\n")
-        self.output_stream.write(f"<keyword> {self.input_stream.keyword()} </keyword>\n") #while
+        yield self._start("whileStatement")
+        yield self._terminal("keyword", self.input_stream.keyword()) #while
         self.input_stream.advance()
-        self.output_stream.write(f"<symbol> {self.input_stream.symbol()} </symbol>\n") # (
+        yield self._terminal("symbol", self.input_stream.symbol()) # (
         self.input_stream.advance()
-        self.compile_expression()
-        self.output_stream.write(f"<symbol> {self.input_stream.symbol()} </symbol>\n") # )
+        yield from self.compile_expression()
+        yield self._terminal("symbol", self.input_stream.symbol()) # )
         self.input_stream.advance()
-        self.output_stream.write(f"<symbol> {self.input_stream.symbol()} </symbol>\n") # {
+        yield self._terminal("symbol", self.input_stream.symbol()) # {
         self.input_stream.advance()
-        self.compile_statements()
-        self.output_stream.write(f"<symbol> {self.input_stream.symbol()} </symbol>\n") # }
+        yield from self.compile_statements()
+        yield self._terminal("symbol", self.input_stream.symbol()) # }
         self.input_stream.advance()
-        self.output_stream.write("</whileStatement>\n")
+        yield self._end("whileStatement")
 
-    def compile_return(self) -> None:
+    def compile_return(self) -> typing.Iterator[Event]:
         """Compiles a return statement."""
-        self.output_stream.write("<returnStatement>\n")
-        self.output_stream.write(f"<keyword> {self.input_stream.keyword()} </keyword>\n") #return
+        yield self._start("returnStatement")
+        yield self._terminal("keyword", self.input_stream.keyword()) #return
         self.input_stream.advance()
         if not (self.input_stream.token_type() == "SYMBOL" and self.input_stream.symbol() == ";"):
-            self.compile_expression()
-        self.output_stream.write(f"<symbol> {self.input_stream.symbol()} </symbol>\n") # ;
+            yield from self.compile_expression()
+        yield self._terminal("symbol", self.input_stream.symbol()) # ;
         self.input_stream.advance()
-        self.output_stream.write("</returnStatement>\n")
+        yield self._end("returnStatement")
 
-    def compile_if(self) -> None:
+    def compile_if(self) -> typing.Iterator[Event]:
         """Compiles a if statement, possibly with a trailing else clause."""
         # Your code goes here!
-        self.output_stream.write("<ifStatement>\n")
-        self.output_stream.write(f"<keyword> {self.input_stream.keyword()} </keyword>\n") #if
+        yield self._start("ifStatement")
+        yield self._terminal("keyword", self.input_stream.keyword()) #if
         self.input_stream.advance()
-        self.output_stream.write(f"<symbol> {self.input_stream.symbol()} </symbol>\n") # (
+        yield self._terminal("symbol", self.input_stream.symbol()) # (
         self.input_stream.advance()
-        self.compile_expression()
-        self.output_stream.write(f"<symbol> {self.input_stream.symbol()} </symbol>\n") # )
+        yield from self.compile_expression()
+        yield self._terminal("symbol", self.input_stream.symbol()) # )
         self.input_stream.advance()
-        self.output_stream.write(f"<symbol> {self.input_stream.symbol()} </symbol>\n") # {
+        yield self._terminal("symbol", self.input_stream.symbol()) # {
         self.input_stream.advance()
-        self.compile_statements()
-        self.output_stream.write(f"<symbol> {self.input_stream.symbol()} </symbol>\n") # }
+        yield from self.compile_statements()
+        yield self._terminal("symbol", self.input_stream.symbol()) # }
         self.input_stream.advance()
         # Optional else clause
         if self.input_stream.keyword() == "else":
-            self.output_stream.write(f"<keyword> {self.input_stream.keyword()} </keyword>\n") # else
+            yield self._terminal("keyword", self.input_stream.keyword()) # else
             self.input_stream.advance()
-            self.output_stream.write(f"<symbol> {self.input_stream.symbol()} </symbol>\n") # {
+            yield self._terminal("symbol", self.input_stream.symbol()) # {
             self.input_stream.advance()
-            self.compile_statements()
-            self.output_stream.write(f"<symbol> {self.input_stream.symbol()} </symbol>\n") # }
+            yield from self.compile_statements()
+            yield self._terminal("symbol", self.input_stream.symbol()) # }
             self.input_stream.advance()
-        self.output_stream.write("</ifStatement>\n")
+        yield self._end("ifStatement")
 
-    def compile_expression(self) -> None:
+    def compile_expression(self) -> typing.Iterator[Event]:
         """Compiles an expression.
         Should finish at the ) or ] or , token as current
         starts after advancing to the first token
         """
-        self.output_stream.write("<expression>\n")
-        self.compile_term()
+        yield self._start("expression")
+        yield from self.compile_term()
         while self.input_stream.token_type() == "SYMBOL" and self.input_stream.symbol() in self.input_stream.ops:
-            self.output_stream.write(f"<symbol> {self.input_stream.symbol()} </symbol>\n")
+            yield self._terminal("symbol", self.input_stream.symbol())
             self.input_stream.advance()
-            self.compile_term()
-        self.output_stream.write("</expression>\n")
+            yield from self.compile_term()
+        yield self._end("expression")
         
 
-    def compile_term(self) -> None:
+    def compile_term(self) -> typing.Iterator[Event]:
         """Compiles a term. 
         the function starts with the current token as the first token of the term.
         The function returns with the current token after the term.
@@ -272,49 +354,50 @@ class CompilationEngine:
         part of this term and should not be advanced over.
         """
         first_token = ""
-        self.output_stream.write("<term>\n")
+        yield self._start("term")
         if self.input_stream.token_type() == "INT_CONST":
-            self.output_stream.write(f"<integerConstant> {self.input_stream.int_val()} </integerConstant>\n") #integerConstant
+            yield self._terminal("integerConstant", self.input_stream.int_val()) #integerConstant
             self.input_stream.advance()
         elif self.input_stream.token_type() == "STRING_CONST":
-            self.output_stream.write(f"<stringConstant> {self.input_stream.string_val()} </stringConstant>\n") #stringConstant
+            yield self._terminal("stringConstant", self.input_stream.string_val()) #stringConstant
             self.input_stream.advance()
         elif self.input_stream.token_type() == "KEYWORD" and self.input_stream.keyword() in ["true", "false", "null", "this"]:
-            self.output_stream.write(f"<keyword> {self.input_stream.keyword()} </keyword>\n")  #keywordConstant
+            yield self._terminal("keyword", self.input_stream.keyword()) #keywordConstant
             self.input_stream.advance()
         elif self.input_stream.token_type() == "SYMBOL" and self.input_stream.symbol() == "(":
-            self.output_stream.write(f"<symbol> {self.input_stream.symbol()} </symbol>\n")
+            yield self._terminal("symbol", self.input_stream.symbol())
             self.input_stream.advance()
-            self.compile_expression()
-            self.output_stream.write(f"<symbol> {self.input_stream.symbol()} </symbol>\n") # )
+            yield from self.compile_expression()
+            yield self._terminal("symbol", self.input_stream.symbol()) # )
             self.input_stream.advance()
         elif self.input_stream.token_type() == "SYMBOL" and self.input_stream.symbol() in self.input_stream.unaryOps:
-            self.output_stream.write(f"<symbol> {self.input_stream.symbol()} </symbol>\n")
+            yield self._terminal("symbol", self.input_stream.symbol())
             self.input_stream.advance()
-            self.compile_term()
+            yield from self.compile_term()
         else:
             first_token = self.input_stream.identifier()
+            first_position = self.input_stream.line_number()
             self.input_stream.advance()
             if self.input_stream.token_type() == "SYMBOL" and self.input_stream.symbol() == "[":
-                self.output_stream.write(f"<identifier> {first_token} </identifier>\n")
-                self.output_stream.write(f"<symbol> {self.input_stream.symbol()} </symbol>\n") # [
+                yield self._terminal("identifier", first_token, first_position)
+                yield self._terminal("symbol", self.input_stream.symbol()) # [
                 self.input_stream.advance()
-                self.compile_expression()
-                self.output_stream.write(f"<symbol> {self.input_stream.symbol()} </symbol>\n") # ]
+                yield from self.compile_expression()
+                yield self._terminal("symbol", self.input_stream.symbol()) # ]
                 self.input_stream.advance()
             elif self.input_stream.token_type() == "SYMBOL" and self.input_stream.symbol() in ["(", "."]:
-                self.compile_subroutine_call(first_token = first_token)
+                yield from self.compile_subroutine_call(first_token = first_token, first_position = first_position)
             else:
-                self.output_stream.write(f"<identifier> {first_token} </identifier>\n")
+                yield self._terminal("identifier", first_token, first_position)
                 
-        self.output_stream.write("</term>\n")
+        yield self._end("term")
 
-    def compile_expression_list(self) -> None:
-        self.output_stream.write("<expressionList>\n")
+    def compile_expression_list(self) -> typing.Iterator[Event]:
+        yield self._start("expressionList")
         while not (self.input_stream.token_type() == "SYMBOL" and self.input_stream.symbol() == ")"):
-            self.compile_expression()
+            yield from self.compile_expression()
             if self.input_stream.token_type() == "SYMBOL" and self.input_stream.symbol() == ",":
-                self.output_stream.write(f"<symbol> {self.input_stream.symbol()} </symbol>\n")
+                yield self._terminal("symbol", self.input_stream.symbol())
                 self.input_stream.advance()
-        self.output_stream.write("</expressionList>\n")
+        yield self._end("expressionList")
         
@@ -5,6 +5,11 @@ was written by Aviv Yaish. It is an extension to the specifications given
 as allowed by the Creative Common Attribution-NonCommercial-ShareAlike 3.0
 Unported [License](https://creativecommons.org/licenses/by-nc-sa/3.0/).
 """
+import time
+# Starts when this module is loaded, so --startup-timing does not cover the
+# interpreter's own startup or the loading of this module from the .pyz.
+_IMPORTS_BEGIN = time.perf_counter()
+
 import os
 import sys
 import typing
@@ -27,21 +32,24 @@ def analyze_file(
     
 
 
-if "__main__" == __name__:
-    # Parses the input path and calls analyze_file on each input file.
-    # This opens both the input and the output files!
-    # Both are closed automatically when the code finishes running.
-    # If the output file does not exist, it is created automatically in the
-    # correct path, using the correct filename.
-    if not len(sys.argv) == 2:
-        sys.exit("Invalid usage, please use: JackAnalyzer <input path>")
-    argument_path = os.path.abspath(sys.argv[1])
+def list_jack_files(path: str) -> typing.List[typing.Tuple[str, str]]:
+    """Lists the files to analyze under the given path.
+
+    Args:
+        path (str): a .jack file, or a directory of .jack files.
+
+    Returns:
+        typing.List[typing.Tuple[str, str]]: (input path, output path) pairs,
+        one per .jack file.
+    """
+    argument_path = os.path.abspath(path)
     if os.path.isdir(argument_path):
         files_to_assemble = [
             os.path.join(argument_path, filename)
             for filename in os.listdir(argument_path)]
     else:
         files_to_assemble = [argument_path]
+    jack_files = []
     for input_path in files_to_assemble:
         filename, extension = os.path.splitext(input_path)
         if extension.lower() != ".jack":
@@ -52,6 +60,62 @@ if "__main__" == __name__:
         # os.makedirs(output_dir, exist_ok=True)
         # output_path = os.path.join(output_dir, name_of_file + ".xml")
         output_path = filename + ".xml"
-        with open(input_path, 'r') as input_file, \
-                open(output_path, 'w') as output_file:
-            analyze_file(input_file, output_file)
+        jack_files.append((input_path, output_path))
+    return jack_files
+
+
+# --startup-timing: print the import and analysis times (not the
+#                   interpreter's startup) to stderr.
+# --async: analyze with AsyncJackAnalyzer.analyze_paths_async.
+USAGE = "Invalid usage, please use: JackAnalyzer [--startup-timing] [--async] <input path>"
+
+
+def main(argv: typing.Optional[typing.List[str]] = None) -> None:
+    """Parses the input path and calls analyze_file on each input file.
+
+    This is the entry point of both JackAnalyzer.py and the packaged
+    JackAnalyzer.pyz (see the "zipapp" rule in the Makefile).
+
+    With --startup-timing, reports on stderr the time spent importing this
+    analyzer's modules ("imports") and analyzing the files ("analysis").
+    The interpreter's own startup is not included in either.
+
+    Args:
+        argv (typing.Optional[typing.List[str]]): the command line arguments,
+            without the program name. Defaults to sys.argv[1:].
+    """
+    if argv is None:
+        argv = sys.argv[1:]
+    startup_timing = "--startup-timing" in argv
+    if startup_timing:
+        argv = [arg for arg in argv if arg != "--startup-timing"]
+        imports_ms = (time.perf_counter() - _IMPORTS_BEGIN) * 1000
+    use_async = "--async" in argv
+    if use_async:
+        argv = [arg for arg in argv if arg != "--async"]
+    # This opens both the input and the output files!
+    # Both are closed automatically when the code finishes running.
+    # If the output file does not exist, it is created automatically in the
+    # correct path, using the correct filename.
+    if not len(argv) == 1:
+        sys.exit(USAGE)
+    analysis_begin = time.perf_counter()
+    if use_async:
+        # Imported here so that plain runs do not pay for asyncio and the
+        # worker pool at startup.
+        import asyncio
+        from AsyncJackAnalyzer import analyze_paths_async
+        asyncio.run(analyze_paths_async([argv[0]]))
+    else:
+        for input_path, output_path in list_jack_files(argv[0]):
+            with open(input_path, 'r') as input_file, \
+                    open(output_path, 'w') as output_file:
+                analyze_file(input_file, output_file)
+    if startup_timing:
+        analysis_ms = (time.perf_counter() - analysis_begin) * 1000
+        sys.stderr.write(
+            f"imports: {imports_ms:.2f} ms, analysis: {analysis_ms:.2f} ms\n")
+
+
+if "__main__" == __name__:
+    main()
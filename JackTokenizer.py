@@ -8,6 +8,20 @@ Unported [License](https://creativecommons.org/licenses/by-nc-sa/3.0/).
 import typing
 
 
+# The token tables are built once, when the module is imported, and shared by
+# every JackTokenizer instance.
+KEYWORDS = frozenset([
+    'class', 'constructor', 'function', 'method', 'field', 'static', 'var',
+    'int', 'char', 'boolean', 'void', 'true', 'false', 'null', 'this', 'let',
+    'do', 'if', 'else', 'while', 'return'])
+SYMBOLS = frozenset([
+    '{', '}', '(', ')', '[', ']', '.', ',', ';', '+', '-', '*', '/', '&', '|',
+    '<', '>', '=', '~', '^', '#'])
+KEYWORD_CONSTANTS = frozenset(['true', 'false', 'null', 'this'])
+UNARY_OPS = frozenset(['-', '~', '^', '#'])
+OPS = frozenset(['+', '-', '*', '/', '&', '|', '<', '>', '='])
+
+
 class JackTokenizer:
     """Removes all comments from the input stream and breaks it
     into Jack language tokens, as specified by the Jack grammar.
@@ -98,23 +112,18 @@ class JackTokenizer:
         Args:
             input_stream (typing.TextIO): input stream.
         """
-        # Your code goes here!
-        # A good place to start is to read all the lines of the input:
-        # input_lines = input_stream.read().splitlines()
-        self.input_lines = input_stream.read().splitlines()
+        # Lines are read one at a time, as the tokens are consumed, so only
+        # the current line of the input is ever held in memory.
+        self.input_stream = input_stream
         self.current_row_index = -1
+        self._reached_end = False
         self.current_token = ""
         self.tokens = []
-        self.keywords = ['class', 'constructor', 'function', 'method', 'field',
-                         'static', 'var', 'int', 'char', 'boolean', 'void', 'true',
-                         'false', 'null', 'this', 'let', 'do', 'if', 'else',
-                         'while', 'return']
-        self.symbols = ['{', '}', '(', ')', '[', ']', '.', ',', ';', '+',
-                        '-', '*', '/', '&', '|', '<', '>', '=', '~', '^', '#']
-        self.keywordConstants = ['true', 'false', 'null', 'this']
-        self.unaryOps = ['-', '~', '^', '#']
-        self.ops = ['+', '-', '*', '/', '&', '|', '<', '>', '=', "&lt;", "&gt;", "&amp;"]
-        self.lines_length = len(self.input_lines)
+        self.keywords = KEYWORDS
+        self.symbols = SYMBOLS
+        self.keywordConstants = KEYWORD_CONSTANTS
+        self.unaryOps = UNARY_OPS
+        self.ops = OPS
         self.current_line_tokens = []
         self._in_block_comment = False
 
@@ -124,13 +133,28 @@ class JackTokenizer:
         Returns:
             bool: True if there are more tokens, False otherwise.
         """
-        return self.current_row_index < self.lines_length
+        return self.current_line_tokens != [] or not self._reached_end
 
-    def delete_current_command(self) -> None:
-        """Deletes the current command."""
-        self.input_lines.pop(self.current_row_index)
-        self.current_row_index = self.current_row_index - 1
-        self.lines_length = self.lines_length - 1
+    def read_next_line(self) -> bool:
+        """Reads the next line of the input into the current token.
+
+        Returns:
+            bool: False if the input has no more lines, True otherwise.
+        """
+        line = self.input_stream.readline()
+        if line == "":
+            self._reached_end = True
+            return False
+        self.current_row_index += 1
+        self.current_token = line.rstrip("\r\n")
+        return True
+
+    def line_number(self) -> int:
+        """
+        Returns:
+            int: the 1-based line of the input the current token came from.
+        """
+        return self.current_row_index + 1
 
     def advance(self) -> bool:
         """Gets the next token from the input and makes it the current token. 
@@ -140,10 +164,8 @@ class JackTokenizer:
         if self.current_line_tokens != []:
             self.current_token = self.current_line_tokens.pop(0)
             return True
-        self.current_row_index += 1
-        if not self.has_more_tokens():
+        if not self.read_next_line():
             return False
-        self.current_token = self.input_lines[self.current_row_index]
         if not self.handle_comments_and_blanks():
             return False
         self.current_token = self._remove_comments_and_blanks(self.current_token)
@@ -204,12 +226,9 @@ class JackTokenizer:
     def handle_comment_block(self) -> bool:
         """Handles multi-line comments in the input."""
         while not self.current_token.strip().endswith("*/"):
-            self.delete_current_command()
-            self.current_row_index += 1
-            if not self.has_more_tokens():
+            if not self.read_next_line():
                 return False
-            self.current_token = self.input_lines[self.current_row_index]
-        return self.has_more_tokens()
+        return True
 
     def handle_comments_and_blanks(self) -> bool:
         """Handles comments and blank lines in the input."""
@@ -219,11 +238,8 @@ class JackTokenizer:
             if self.current_token.strip().startswith("/**") and not self.current_token.strip().endswith("*/"):
                 if not self.handle_comment_block():
                     return False
-            self.delete_current_command()
-            self.current_row_index += 1
-            if not self.has_more_tokens():
+            if not self.read_next_line():
                 return False
-            self.current_token = self.input_lines[self.current_row_index]
         return True
 
     def _remove_comments_and_blanks (self,line: str) -> str:
@@ -299,13 +315,8 @@ class JackTokenizer:
             Recall that symbol was defined in the grammar like so:
             symbol: '{' | '}' | '(' | ')' | '[' | ']' | '.' | ',' | ';' | '+' | 
               '-' | '*' | '/' | '&' | '|' | '<' | '>' | '=' | '~' | '^' | '#'
+            XML escaping is left to the output writer.
         """
-        if self.current_token == "<":
-            return "&lt;"
-        if self.current_token == ">":
-            return "&gt;"
-        if self.current_token == "&":
-            return "&amp;"
         return self.current_token
 
     def identifier(self) -> str:
@@ -0,0 +1,110 @@
+"""
+Tests for AsyncJackAnalyzer.py. Run with "make test".
+"""
+import asyncio
+import concurrent.futures
+import io
+import os
+import tempfile
+import threading
+import time
+import unittest
+from AsyncJackAnalyzer import analyze_paths_async
+from JackAnalyzer import analyze_file, list_jack_files
+
+
+SOURCE = """\
+// Class number {0}.
+class Main{0} {{
+    field int x;
+
+    /** Returns x + {0}. */
+    method int get() {{
+        return x + {0};
+    }}
+}}
+"""
+
+
+class CountingExecutor(concurrent.futures.ThreadPoolExecutor):
+    """Runs the parsing on threads, recording how many ran at once."""
+
+    def __init__(self) -> None:
+        super().__init__(max_workers=16)
+        self._lock = threading.Lock()
+        self.running = 0
+        self.max_running = 0
+
+    def submit(self, fn, *args, **kwargs) -> concurrent.futures.Future:
+        def counted():
+            with self._lock:
+                self.running += 1
+                self.max_running = max(self.max_running, self.running)
+            try:
+                time.sleep(0.02)
+                return fn(*args, **kwargs)
+            finally:
+                with self._lock:
+                    self.running -= 1
+        return super().submit(counted)
+
+
+class AnalyzePathsAsyncTest(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self._directory = tempfile.TemporaryDirectory()
+        self.directory = self._directory.name
+        for index in range(6):
+            with open(os.path.join(self.directory, f"Main{index}.jack"),
+                      'w') as input_file:
+                input_file.write(SOURCE.format(index))
+        with open(os.path.join(self.directory, "notes.txt"), 'w') as notes:
+            notes.write("not a jack file")
+
+    def tearDown(self) -> None:
+        self._directory.cleanup()
+
+    def assert_outputs_match_analyze_file(self) -> None:
+        for input_path, output_path in list_jack_files(self.directory):
+            expected = io.StringIO()
+            with open(input_path, 'r') as input_file:
+                analyze_file(input_file, expected)
+            with open(output_path, 'r') as output_file:
+                self.assertEqual(output_file.read(), expected.getvalue())
+
+    def test_outputs_match_analyze_file(self) -> None:
+        written = asyncio.run(analyze_paths_async([self.directory]))
+        self.assertEqual(
+            written,
+            [output_path for _, output_path in list_jack_files(self.directory)])
+        self.assertEqual(len(written), 6)
+        self.assert_outputs_match_analyze_file()
+
+    def test_max_files_in_flight(self) -> None:
+        with CountingExecutor() as parse_executor:
+            asyncio.run(analyze_paths_async(
+                [self.directory], max_files_in_flight=2,
+                parse_executor=parse_executor))
+        self.assertLessEqual(parse_executor.max_running, 2)
+        self.assert_outputs_match_analyze_file()
+
+    def test_files_larger_than_the_byte_budget(self) -> None:
+        with CountingExecutor() as parse_executor:
+            written = asyncio.run(analyze_paths_async(
+                [self.directory], max_bytes_in_flight=10,
+                parse_executor=parse_executor))
+        self.assertEqual(len(written), 6)
+        self.assertEqual(parse_executor.max_running, 1)
+        self.assert_outputs_match_analyze_file()
+
+    def test_rejects_no_workers(self) -> None:
+        for arguments in ({"max_files_in_flight": 0}, {"io_workers": 0}):
+            with self.assertRaises(ValueError):
+                asyncio.run(analyze_paths_async([self.directory], **arguments))
+        self.assertFalse(any(
+            os.path.exists(output_path)
+            for _, output_path in list_jack_files(self.directory)))
+
+
+if __name__ == "__main__":
+    unittest.main()
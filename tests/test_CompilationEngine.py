@@ -0,0 +1,215 @@
+"""
+Tests for the parse-event API of CompilationEngine.py. Run with "make test".
+"""
+import io
+import unittest
+from CompilationEngine import (
+    CompilationEngine, END_ELEMENT, START_ELEMENT, TERMINAL, iter_events,
+    write_xml)
+from JackTokenizer import JackTokenizer
+
+
+SOURCE = """\
+// A comment before the class.
+/** A multi-line
+ * API comment.
+ */
+class Foo {
+    field int x; // trailing comment
+
+    /** Doc comment. */
+    method void bar(int a) {
+        let x = a < 3;
+        return;
+    }
+}
+"""
+
+# Empty elements split across lines.
+EMPTY_ELEMENTS_SOURCE = """\
+class Bar {
+    method void f(
+    ) {
+    }
+    function void g() {
+        do h(
+        );
+        return;
+    }
+}
+"""
+
+# The output of the analyzer before the parse events were added.
+OLD_XML = """\
+<class>
+<keyword> class </keyword>
+<identifier> Foo </identifier>
+<symbol> { </symbol>
+<classVarDec>
+<keyword> field </keyword>
+<keyword>int</keyword>
+<identifier> x </identifier>
+<symbol> ; </symbol>
+</classVarDec>
+<subroutineDec>
+<keyword> method </keyword>
+<keyword>void</keyword>
+<identifier> bar </identifier>
+<symbol> ( </symbol>
+<parameterList>
+<keyword>int</keyword>
+<identifier> a </identifier>
+</parameterList>
+<symbol> ) </symbol>
+<subroutineBody>
+<symbol> { </symbol>
+<statements>
+<letStatement>
+<keyword> let </keyword>
+<identifier> x </identifier>
+<symbol> = </symbol>
+<expression>
+<term>
+<identifier> a </identifier>
+</term>
+<symbol> &lt; </symbol>
+<term>
+<integerConstant> 3 </integerConstant>
+</term>
+</expression>
+<symbol> ; </symbol>
+</letStatement>
+<returnStatement>
+<keyword> return </keyword>
+<symbol> ; </symbol>
+</returnStatement>
+</statements>
+<symbol> } </symbol>
+</subroutineBody>
+</subroutineDec>
+<symbol> } </symbol>
+</class>"""
+
+
+def compile_to_xml(source: str) -> str:
+    output_stream = io.StringIO()
+    CompilationEngine(JackTokenizer(io.StringIO(source)), output_stream)
+    return output_stream.getvalue()
+
+
+def normalize_xml(xml: str) -> str:
+    """Removes all the whitespace from the XML, as the course's comparer
+    ignores it."""
+    return "".join(xml.split())
+
+
+class IterEventsTest(unittest.TestCase):
+
+    def test_events_and_positions(self) -> None:
+        events = list(iter_events(JackTokenizer(io.StringIO(SOURCE))))
+        self.assertEqual(events, [
+            (START_ELEMENT, "class", None, 5),
+            (TERMINAL, "keyword", "class", 5),
+            (TERMINAL, "identifier", "Foo", 5),
+            (TERMINAL, "symbol", "{", 5),
+            (START_ELEMENT, "classVarDec", None, 6),
+            (TERMINAL, "keyword", "field", 6),
+            (TERMINAL, "keyword", "int", 6),
+            (TERMINAL, "identifier", "x", 6),
+            (TERMINAL, "symbol", ";", 6),
+            (END_ELEMENT, "classVarDec", None, 6),
+            (START_ELEMENT, "subroutineDec", None, 9),
+            (TERMINAL, "keyword", "method", 9),
+            (TERMINAL, "keyword", "void", 9),
+            (TERMINAL, "identifier", "bar", 9),
+            (TERMINAL, "symbol", "(", 9),
+            (START_ELEMENT, "parameterList", None, 9),
+            (TERMINAL, "keyword", "int", 9),
+            (TERMINAL, "identifier", "a", 9),
+            (END_ELEMENT, "parameterList", None, 9),
+            (TERMINAL, "symbol", ")", 9),
+            (START_ELEMENT, "subroutineBody", None, 9),
+            (TERMINAL, "symbol", "{", 9),
+            (START_ELEMENT, "statements", None, 10),
+            (START_ELEMENT, "letStatement", None, 10),
+            (TERMINAL, "keyword", "let", 10),
+            (TERMINAL, "identifier", "x", 10),
+            (TERMINAL, "symbol", "=", 10),
+            (START_ELEMENT, "expression", None, 10),
+            (START_ELEMENT, "term", None, 10),
+            (TERMINAL, "identifier", "a", 10),
+            (END_ELEMENT, "term", None, 10),
+            (TERMINAL, "symbol", "<", 10),
+            (START_ELEMENT, "term", None, 10),
+            (TERMINAL, "integerConstant", 3, 10),
+            (END_ELEMENT, "term", None, 10),
+            (END_ELEMENT, "expression", None, 10),
+            (TERMINAL, "symbol", ";", 10),
+            (END_ELEMENT, "letStatement", None, 10),
+            (START_ELEMENT, "returnStatement", None, 11),
+            (TERMINAL, "keyword", "return", 11),
+            (TERMINAL, "symbol", ";", 11),
+            (END_ELEMENT, "returnStatement", None, 11),
+            (END_ELEMENT, "statements", None, 11),
+            (TERMINAL, "symbol", "}", 12),
+            (END_ELEMENT, "subroutineBody", None, 12),
+            (END_ELEMENT, "subroutineDec", None, 12),
+            (TERMINAL, "symbol", "}", 13),
+            (END_ELEMENT, "class", None, 13),
+        ])
+
+    def test_empty_elements_end_where_they_start(self) -> None:
+        events = list(iter_events(
+            JackTokenizer(io.StringIO(EMPTY_ELEMENTS_SOURCE))))
+        empty_elements = [
+            (start[1], start[3], end[3])
+            for start, end in zip(events, events[1:])
+            if start[0] == START_ELEMENT and end[0] == END_ELEMENT]
+        self.assertEqual(empty_elements, [
+            ("parameterList", 3, 3),
+            ("statements", 4, 4),
+            ("parameterList", 5, 5),
+            ("expressionList", 7, 7),
+        ])
+
+    def test_elements_never_end_before_they_start(self) -> None:
+        for source in (SOURCE, EMPTY_ELEMENTS_SOURCE):
+            start_positions = []
+            for event, kind, _, position in iter_events(
+                    JackTokenizer(io.StringIO(source))):
+                if event == START_ELEMENT:
+                    start_positions.append(position)
+                elif event == END_ELEMENT:
+                    self.assertGreaterEqual(
+                        position, start_positions.pop(), kind)
+
+    def test_events_are_lazy(self) -> None:
+        input_stream = io.StringIO(SOURCE)
+        tokenizer = JackTokenizer(input_stream)
+        events = iter_events(tokenizer)
+        self.assertEqual(next(events), (START_ELEMENT, "class", None, 5))
+        # Only the lines up to the class declaration have been read.
+        self.assertEqual(tokenizer.line_number(), 5)
+        self.assertEqual(input_stream.tell(),
+                         len("".join(SOURCE.splitlines(True)[:5])))
+
+
+class WriteXmlTest(unittest.TestCase):
+
+    def test_matches_old_output_up_to_whitespace(self) -> None:
+        self.assertEqual(normalize_xml(compile_to_xml(SOURCE)),
+                         normalize_xml(OLD_XML))
+
+    def test_escapes_symbols_and_strings(self) -> None:
+        output_stream = io.StringIO()
+        write_xml([(TERMINAL, "symbol", "&", 1),
+                   (TERMINAL, "stringConstant", "a < b & c > d", 1)],
+                  output_stream)
+        self.assertEqual(output_stream.getvalue(),
+                         "<symbol> &amp; </symbol>\n"
+                         "<stringConstant> a &lt; b &amp; c &gt; d "
+                         "</stringConstant>\n")
+
+
+if __name__ == "__main__":
+    unittest.main()